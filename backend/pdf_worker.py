@@ -0,0 +1,16 @@
+"""Process-pool worker for PDF page-range extraction.
+
+Lives in its own module so pool workers started with the spawn method
+(the default on macOS/Windows) import only this file - importing
+server.py would load the embedding model and run the warm-up encode
+once per worker on every large-PDF upload.
+"""
+import fitz  # PyMuPDF
+
+def extract_page_range(args):
+    """Reopen the PDF and extract one contiguous range of pages"""
+    file_path, start, end = args
+    doc = fitz.open(file_path)
+    text = "\n".join(doc[i].get_text("text") for i in range(start, end))
+    doc.close()
+    return text
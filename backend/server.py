@@ -1,26 +1,62 @@
-from flask import Flask, request, jsonify, Response
-from flask_cors import CORS
-import requests
+from quart import Quart, request, jsonify, Response
+from quart.json.provider import JSONProvider
+from quart_cors import cors
+import httpx
+import orjson
+import asyncio
+import functools
+import hashlib
 import os
+import re
+import sqlite3
 from dotenv import load_dotenv
-import json
 from werkzeug.utils import secure_filename
+import numpy as np
+import fitz  # PyMuPDF
 import PyPDF2
 from docx import Document
 from datetime import datetime
 import chromadb
+import torch
 from sentence_transformers import SentenceTransformer
 from chromadb.config import Settings
+from concurrent.futures import ProcessPoolExecutor
+
+# Works whether the app runs as a package (hypercorn backend.server:app)
+# or as a script from backend/ (python server.py)
+try:
+    from backend.pdf_worker import extract_page_range
+except ImportError:
+    from pdf_worker import extract_page_range
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson's C encoder (several times faster
+    than stdlib json, emits UTF-8 bytes directly)"""
+
+    def dumps(self, object_, **kwargs):
+        return orjson.dumps(object_).decode()
+
+    def loads(self, object_, **kwargs):
+        return orjson.loads(object_)
+
+app = Quart(__name__)
+app.json = ORJSONProvider(app)
+app = cors(app, allow_origin="*")
 
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages'
 
+# Shared client for the Anthropic API - keeps the TCP/TLS connection
+# pool warm across chat requests instead of paying the handshake
+# (100ms+) on every one, and multiplexes over HTTP/2
+anthropic_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(None, connect=10)
+)
+
 # Configure upload settings
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx', 'md'}
@@ -30,59 +66,134 @@ MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 CHUNK_SIZE = 1000  # characters
 CHUNK_OVERLAP = 200  # characters overlap between chunks
 
+# PDFs larger than this get their pages parsed in parallel across CPU cores
+PARALLEL_PAGE_THRESHOLD = 20
+
+# Embedded chunks accumulate until this many are pending, then flush to
+# Chroma in a single add
+CHROMA_ADD_BATCH = 512
+
 # Create necessary directories
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs('chroma_db', exist_ok=True)
 
 # Initialize embedding model (this loads once on startup)
 print("Loading embedding model...")
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+torch.set_num_threads(os.cpu_count() or 1)  # deterministic CPU BLAS threading
+if torch.cuda.is_available():
+    # One batched GPU call replaces thousands of CPU matmuls; larger
+    # batches keep the device busy
+    embedding_model = SentenceTransformer('all-MiniLM-L6-v2', device='cuda')
+    EMBED_BATCH_SIZE = 256
+else:
+    EMBED_BATCH_SIZE = 64
+    try:
+        # int8-quantized ONNX export encodes 2-4x faster than the default
+        # FP32 torch model on modern x86 (VNNI int8 kernels), with
+        # near-identical embeddings
+        embedding_model = SentenceTransformer(
+            'all-MiniLM-L6-v2',
+            backend='onnx',
+            model_kwargs={'file_name': 'onnx/model_qint8_avx512_vnni.onnx'}
+        )
+    except Exception as e:
+        print(f"ONNX backend unavailable ({e}), falling back to PyTorch")
+        embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Warm-up pass: the first encode pays one-time kernel/buffer setup, so
+# take that hit at startup instead of on the first user request
+embedding_model.encode(["warmup"], convert_to_numpy=True)
 print("Embedding model loaded!")
 
 # Initialize Chroma client
+# Embeddings are L2-normalized at encode time, so inner product ranks
+# identically to cosine but skips the norm computation inside HNSW.
+# (Delete ./chroma_db to rebuild an index created with the old settings.)
 chroma_client = chromadb.PersistentClient(path="./chroma_db")
 collection = chroma_client.get_or_create_collection(
     name="documents",
-    metadata={"hnsw:space": "cosine"}
+    metadata={"hnsw:space": "ip"}
 )
 
-# In-memory storage for documents
-documents_db = []
+# Persistent metadata store - document records survive restarts, so a
+# reload never forces re-ingesting (and re-embedding) everything
+documents_conn = sqlite3.connect('documents.db', check_same_thread=False)
+documents_conn.row_factory = sqlite3.Row
+documents_conn.execute("""
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        filename TEXT,
+        unique_filename TEXT,
+        file_path TEXT,
+        upload_date TEXT,
+        file_type TEXT,
+        word_count INTEGER,
+        char_count INTEGER,
+        chunk_count INTEGER,
+        text_preview TEXT,
+        content_hash TEXT
+    )
+""")
+documents_conn.commit()
+
+# Databases created before deduplication predate the content_hash column
+try:
+    documents_conn.execute('ALTER TABLE documents ADD COLUMN content_hash TEXT')
+    documents_conn.commit()
+except sqlite3.OperationalError:
+    pass
+
+# In-memory cache of document metadata, keyed by doc id for O(1)
+# lookup/delete; loaded from SQLite once at startup
+documents_db = {
+    row['id']: dict(row)
+    for row in documents_conn.execute('SELECT * FROM documents')
+}
+
+# Components of L2-normalized all-MiniLM-L6-v2 embeddings stay well
+# inside [-0.5, 0.5], so mapping that range onto int8 keeps resolution
+# without clipping in practice
+EMBEDDING_QUANT_SCALE = 127.0 / 0.5
+
+def quantize_embedding(embedding):
+    """Snap a normalized float embedding onto a fixed int8 grid.
+
+    Rounding every component to one of 255 levels keeps vectors compact
+    and compression-friendly; dividing the grid values back by the scale
+    keeps them unit-sized, so the inner-product distances Chroma returns
+    stay on the usual 1 - cos scale instead of being blown up by the
+    quantization factor.
+    """
+    arr = np.asarray(embedding, dtype=np.float32)
+    quantized = np.clip(np.rint(arr * EMBEDDING_QUANT_SCALE), -127, 127)
+    return quantized / EMBEDDING_QUANT_SCALE
+
+@functools.lru_cache(maxsize=1024)
+def _embed_query(query):
+    """Encode a search query, memoized so repeated queries skip the model.
+
+    Retries, follow-ups and pagination often resend the same query text;
+    the cache turns those into a dict lookup instead of a forward pass.
+    Returns a tuple so the result is hashable for the cache.
+    """
+    embedding = embedding_model.encode(query.strip(), normalize_embeddings=True)
+    return tuple(float(v) for v in quantize_embedding(embedding))
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
-    """Split text into overlapping chunks"""
-    chunks = []
-    start = 0
-    text_length = len(text)
-    
-    while start < text_length:
-        end = start + chunk_size
-        chunk = text[start:end]
-        
-        if chunk.strip():  # Only add non-empty chunks
-            chunks.append({
-                'text': chunk,
-                'start_pos': start,
-                'end_pos': min(end, text_length)
-            })
-        
-        start += chunk_size - overlap
-    
-    return chunks
-
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+def extract_text_from_pdf_fallback(file_path):
+    """Fallback PDF extraction with PyPDF2 for files PyMuPDF can't open"""
     try:
-        text = ""
+        # Collect page texts and join once; += on a growing string
+        # reallocates the whole buffer every page
+        parts = []
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+                parts.append(page.extract_text() or "")
+                parts.append("\n")
+        return "".join(parts)
     except Exception as e:
         print(f"Error extracting PDF text: {str(e)}")
         return None
@@ -107,26 +218,186 @@ def extract_text_from_txt(file_path):
         return None
 
 def process_document(file_path, filename):
-    """Process document and extract text based on file type"""
+    """Extract the full text of a non-PDF document based on file type
+    (PDFs go through iter_pdf_text instead)"""
     extension = filename.rsplit('.', 1)[1].lower()
-    
-    if extension == 'pdf':
-        return extract_text_from_pdf(file_path)
-    elif extension == 'docx':
+
+    if extension == 'docx':
         return extract_text_from_docx(file_path)
     elif extension in ['txt', 'md']:
         return extract_text_from_txt(file_path)
     else:
         return None
 
+def iter_pdf_text(file_path):
+    """Yield PDF text piece by piece: per page for small documents, per
+    parallel-extracted page range for large ones"""
+    yielded = False
+    try:
+        doc = fitz.open(file_path)
+        page_count = doc.page_count
+
+        # Small documents: extract inline, pool overhead isn't worth it
+        if page_count <= PARALLEL_PAGE_THRESHOLD:
+            for i, page in enumerate(doc):
+                yield ("\n" if i else "") + page.get_text("text")
+                yielded = True
+            doc.close()
+            return
+
+        # Large documents: one page range per core, streamed out in order
+        # as the workers finish
+        doc.close()
+        workers = min(os.cpu_count() or 1, page_count)
+        per_worker = -(-page_count // workers)  # ceiling division
+        ranges = [
+            (file_path, start, min(start + per_worker, page_count))
+            for start in range(0, page_count, per_worker)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for i, text in enumerate(executor.map(extract_page_range, ranges)):
+                yield ("\n" if i else "") + text
+                yielded = True
+    except Exception as e:
+        print(f"Error extracting PDF text with PyMuPDF: {str(e)}")
+
+        # Don't fall back once pieces have been yielded: downstream may
+        # already have embedded them, and re-yielding the whole document
+        # would index duplicated content at wrong offsets
+        if yielded:
+            raise ValueError('PDF extraction failed partway through') from e
+
+        text = extract_text_from_pdf_fallback(file_path)
+        if text is None:
+            raise ValueError('Failed to extract text from document') from e
+        yield text
+
+def iter_document_text(file_path, filename):
+    """Yield document text piece by piece based on file type"""
+    extension = filename.rsplit('.', 1)[1].lower()
+
+    if extension == 'pdf':
+        yield from iter_pdf_text(file_path)
+    else:
+        text = process_document(file_path, filename)
+        if text is None:
+            raise ValueError('Failed to extract text from document')
+        yield text
+
+def iter_text_chunks(pieces, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Yield overlapping chunks as text pieces stream in.
+
+    Chunks start every (chunk_size - overlap) characters of the
+    concatenated text, but only a chunk-sized rolling buffer is ever
+    held instead of the whole document.
+    """
+    step = chunk_size - overlap
+    buffer = ''
+    offset = 0  # absolute position of buffer[0] in the full text
+
+    for piece in pieces:
+        buffer += piece
+        # Walk an index over the buffer and compact it once per piece;
+        # re-slicing the buffer for every chunk goes quadratic when a
+        # whole document arrives as a single piece
+        pos = 0
+        while len(buffer) - pos >= chunk_size:
+            chunk = buffer[pos:pos + chunk_size]
+            if chunk.strip():  # Only add non-empty chunks
+                yield {
+                    'text': chunk,
+                    'start_pos': offset,
+                    'end_pos': offset + chunk_size
+                }
+            pos += step
+            offset += step
+        buffer = buffer[pos:]
+
+    # Tail chunks shorter than chunk_size
+    pos = 0
+    while pos < len(buffer):
+        chunk = buffer[pos:pos + chunk_size]
+        if chunk.strip():
+            yield {
+                'text': chunk,
+                'start_pos': offset,
+                'end_pos': offset + len(chunk)
+            }
+        pos += step
+        offset += step
+
+def _index_chunk_batch(doc_id, filename, batch, start_index, pending):
+    """Encode one batch of chunks and append them to the pending Chroma add"""
+    texts = [chunk_data['text'] for chunk_data in batch]
+    embeddings = embedding_model.encode(
+        texts,
+        batch_size=EMBED_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+    for i, chunk_data in enumerate(batch):
+        index = start_index + i
+        pending['ids'].append(f"doc_{doc_id}_chunk_{index}")
+        pending['embeddings'].append(quantize_embedding(embeddings[i]).tolist())
+        pending['documents'].append(chunk_data['text'])
+        pending['metadatas'].append({
+            'doc_id': doc_id,
+            'filename': filename,
+            'chunk_index': index,
+            'start_pos': chunk_data['start_pos'],
+            'end_pos': chunk_data['end_pos']
+        })
+
+def index_chunks(doc_id, filename, chunks):
+    """Stream chunks through the embedding model and into Chroma.
+
+    Encodes EMBED_BATCH_SIZE chunks at a time and flushes to Chroma once
+    CHROMA_ADD_BATCH embeddings are pending, so embedding starts before
+    extraction finishes and peak memory stays O(batch), not O(document).
+    Returns the number of chunks indexed.
+    """
+    pending = {'ids': [], 'embeddings': [], 'documents': [], 'metadatas': []}
+    batch = []
+    chunk_count = 0
+
+    def flush_pending():
+        collection.add(
+            ids=pending['ids'],
+            embeddings=pending['embeddings'],
+            documents=pending['documents'],
+            metadatas=pending['metadatas']
+        )
+        for values in pending.values():
+            values.clear()
+
+    for chunk_data in chunks:
+        batch.append(chunk_data)
+        if len(batch) == EMBED_BATCH_SIZE:
+            _index_chunk_batch(doc_id, filename, batch, chunk_count, pending)
+            chunk_count += len(batch)
+            batch = []
+            if len(pending['ids']) >= CHROMA_ADD_BATCH:
+                flush_pending()
+
+    if batch:
+        _index_chunk_batch(doc_id, filename, batch, chunk_count, pending)
+        chunk_count += len(batch)
+    if pending['ids']:
+        flush_pending()
+
+    return chunk_count
+
 @app.route('/api/upload', methods=['POST'])
-def upload_document():
+async def upload_document():
     """Handle document upload and create embeddings"""
     try:
-        if 'file' not in request.files:
+        files = await request.files
+        if 'file' not in files:
             return jsonify({'error': 'No file provided'}), 400
-        
-        file = request.files['file']
+
+        file = files['file']
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -140,53 +411,76 @@ def upload_document():
         unique_filename = f"{timestamp}_{filename}"
         file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
         
-        # Save file
-        file.save(file_path)
-        
-        # Extract text from document
-        text_content = process_document(file_path, filename)
-        
-        if text_content is None:
+        # Save file - stream to disk in 1 MiB blocks so a large upload
+        # never sits fully buffered in memory, hashing as we go so exact
+        # re-uploads can be detected without another pass over the file.
+        # Runs in a thread so the write loop doesn't block the event loop.
+        hasher = hashlib.blake2b(digest_size=16)
+
+        def save_and_hash():
+            with open(file_path, 'wb') as out:
+                for block in iter(lambda: file.stream.read(1024 * 1024), b''):
+                    hasher.update(block)
+                    out.write(block)
+
+        await asyncio.to_thread(save_and_hash)
+        content_hash = hasher.hexdigest()
+
+        # Same bytes already indexed? Skip re-extraction and re-embedding
+        existing = next(
+            (d for d in documents_db.values() if d.get('content_hash') == content_hash),
+            None
+        )
+        if existing:
+            os.remove(file_path)
+            response_data = {k: v for k, v in existing.items() if k != 'text_preview'}
+            return jsonify({
+                'message': 'Document already indexed - identical content, skipping re-embedding',
+                'document': response_data
+            }), 200
+        
+        # Extract, chunk and embed as one streaming pipeline: pages feed
+        # the chunker, chunks feed encode batches, batches flush to
+        # Chroma - the full document text is never held in memory.
+        # Stats and the preview accumulate as pieces stream past.
+        stats = {'char_count': 0, 'word_count': 0, 'preview': ''}
+
+        def counted_pieces():
+            for piece in iter_document_text(file_path, filename):
+                stats['char_count'] += len(piece)
+                # Count words without .split(), which would allocate a
+                # list of every word just to take its length
+                stats['word_count'] += sum(1 for _ in re.finditer(r'\S+', piece))
+                if len(stats['preview']) < 500:
+                    stats['preview'] += piece[:500 - len(stats['preview'])]
+                yield piece
+
+        doc_id = max(documents_db, default=0) + 1
+
+        try:
+            # The extract/chunk/embed pipeline is CPU-bound and entirely
+            # synchronous; run it in a thread so a long upload doesn't
+            # stall every other request on the event loop
+            chunk_count = await asyncio.to_thread(
+                index_chunks, doc_id, filename, iter_text_chunks(counted_pieces())
+            )
+        except ValueError:
+            # Drop any chunks that reached Chroma before the failure so a
+            # later upload can't collide with the orphaned ids
+            try:
+                collection.delete(where={'doc_id': doc_id})
+            except Exception as e:
+                print(f"Error cleaning up partial chunks: {e}")
             os.remove(file_path)
             return jsonify({'error': 'Failed to extract text from document'}), 500
-        
-        # Create chunks
-        chunks = chunk_text(text_content)
-        
-        if not chunks:
+
+        if chunk_count == 0:
             os.remove(file_path)
             return jsonify({'error': 'Document is empty or could not be chunked'}), 400
-        
-        # Generate embeddings and store in Chroma
-        doc_id = len(documents_db) + 1
-        
-        for i, chunk_data in enumerate(chunks):
-            text = chunk_data['text']
-            
-            # Generate embedding
-            embedding = embedding_model.encode(text).tolist()
-            
-            # Create unique ID for this chunk
-            chunk_id = f"doc_{doc_id}_chunk_{i}"
-            
-            # Add to Chroma with metadata
-            collection.add(
-                ids=[chunk_id],
-                embeddings=[embedding],
-                documents=[text],
-                metadatas=[{
-                    'doc_id': doc_id,
-                    'filename': filename,
-                    'chunk_index': i,
-                    'start_pos': chunk_data['start_pos'],
-                    'end_pos': chunk_data['end_pos']
-                }]
-            )
-        
-        # Calculate stats
-        word_count = len(text_content.split())
-        char_count = len(text_content)
-        
+
+        word_count = stats['word_count']
+        char_count = stats['char_count']
+
         # Store document metadata
         doc_metadata = {
             'id': doc_id,
@@ -197,15 +491,25 @@ def upload_document():
             'file_type': filename.rsplit('.', 1)[1].lower(),
             'word_count': word_count,
             'char_count': char_count,
-            'chunk_count': len(chunks),
-            'text_preview': text_content[:500] + '...' if len(text_content) > 500 else text_content
+            'chunk_count': chunk_count,
+            'text_preview': stats['preview'] + '...' if char_count > 500 else stats['preview'],
+            'content_hash': content_hash
         }
         
-        documents_db.append(doc_metadata)
+        documents_db[doc_id] = doc_metadata
+        documents_conn.execute(
+            """INSERT INTO documents VALUES (
+                :id, :filename, :unique_filename, :file_path, :upload_date,
+                :file_type, :word_count, :char_count, :chunk_count,
+                :text_preview, :content_hash
+            )""",
+            doc_metadata
+        )
+        documents_conn.commit()
         
         # Return response
         response_data = {k: v for k, v in doc_metadata.items() if k != 'text_preview'}
-        response_data['preview'] = text_content[:200] + '...' if len(text_content) > 200 else text_content
+        response_data['preview'] = stats['preview'][:200] + '...' if char_count > 200 else stats['preview']
         
         return jsonify({
             'message': 'Document uploaded and indexed successfully',
@@ -217,11 +521,11 @@ def upload_document():
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
 @app.route('/api/documents', methods=['GET'])
-def get_documents():
+async def get_documents():
     """Get list of all uploaded documents"""
     try:
         docs_list = []
-        for doc in documents_db:
+        for doc in documents_db.values():
             doc_info = {k: v for k, v in doc.items() if k not in ['text_preview', 'file_path']}
             docs_list.append(doc_info)
         
@@ -231,16 +535,17 @@ def get_documents():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/documents/<int:doc_id>', methods=['DELETE'])
-def delete_document(doc_id):
+async def delete_document(doc_id):
     """Delete a document and its embeddings"""
     try:
-        global documents_db
-        
-        # Find document
-        doc = next((d for d in documents_db if d['id'] == doc_id), None)
-        
+        # Remove document (O(1) dict pop instead of scanning a list)
+        doc = documents_db.pop(doc_id, None)
+
         if not doc:
             return jsonify({'error': 'Document not found'}), 404
+
+        documents_conn.execute('DELETE FROM documents WHERE id = ?', (doc_id,))
+        documents_conn.commit()
         
         # Delete embeddings from Chroma
         # Get all chunk IDs for this document
@@ -250,13 +555,12 @@ def delete_document(doc_id):
         except Exception as e:
             print(f"Error deleting embeddings: {e}")
         
-        # Delete file from disk
-        if os.path.exists(doc['file_path']):
+        # Delete file from disk - one syscall, and no exists/remove race
+        try:
             os.remove(doc['file_path'])
-        
-        # Remove from database
-        documents_db = [d for d in documents_db if d['id'] != doc_id]
-        
+        except FileNotFoundError:
+            pass
+
         return jsonify({'message': 'Document deleted successfully'}), 200
         
     except Exception as e:
@@ -264,21 +568,24 @@ def delete_document(doc_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/search', methods=['POST'])
-def search_documents():
+async def search_documents():
     """Search documents using semantic similarity"""
     try:
-        data = request.json
+        data = await request.get_json()
         query = data.get('query', '')
         top_k = data.get('top_k', 3)
         
         if not query:
             return jsonify({'error': 'Query is required'}), 400
         
-        # Generate embedding for query
-        query_embedding = embedding_model.encode(query).tolist()
-        
+        # Generate embedding for query (cached for repeated queries);
+        # encoding and the HNSW search both block, so run them in a
+        # thread to keep the event loop free
+        query_embedding = list(await asyncio.to_thread(_embed_query, query))
+
         # Search in Chroma
-        results = collection.query(
+        results = await asyncio.to_thread(
+            collection.query,
             query_embeddings=[query_embedding],
             n_results=top_k
         )
@@ -303,10 +610,10 @@ def search_documents():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/chat', methods=['POST'])
-def chat():
+async def chat():
     """Handle chat requests with RAG - retrieve relevant context from documents"""
     try:
-        data = request.json
+        data = await request.get_json()
         messages = data.get('messages', [])
         use_rag = data.get('use_rag', True)  # Enable RAG by default
         
@@ -326,11 +633,14 @@ def chat():
         if use_rag and last_user_message and len(documents_db) > 0:
             query = last_user_message['content']
             
-            # Generate embedding for query
-            query_embedding = embedding_model.encode(query).tolist()
-            
+            # Generate embedding for query (cached for repeated queries);
+            # run encode and search in a thread so retrieval doesn't
+            # stall other in-flight streams
+            query_embedding = list(await asyncio.to_thread(_embed_query, query))
+
             # Search for relevant chunks
-            results = collection.query(
+            results = await asyncio.to_thread(
+                collection.query,
                 query_embeddings=[query_embedding],
                 n_results=3
             )
@@ -369,20 +679,21 @@ Answer the user's question based on this context."""
             'stream': True
         }
 
-        # Stream response from Anthropic
-        def generate():
-            with requests.post(ANTHROPIC_API_URL, headers=headers, json=payload, stream=True) as response:
+        # Stream response from Anthropic - async, so the worker isn't
+        # pinned for the duration of the model response
+        async def generate():
+            async with anthropic_client.stream('POST', ANTHROPIC_API_URL, headers=headers, json=payload) as response:
                 if response.status_code != 200:
-                    error_data = response.json()
-                    yield f"data: {json.dumps({'error': error_data})}\n\n"
+                    error_data = orjson.loads(await response.aread())
+                    yield b"data: " + orjson.dumps({'error': error_data}) + b"\n\n"
                     return
-                
-                for line in response.iter_lines():
-                    if line:
-                        decoded_line = line.decode('utf-8')
-                        if decoded_line.startswith('data: '):
-                            yield f"{decoded_line}\n\n"
-        
+
+                # Forward the upstream SSE bytes untouched - the client
+                # already filters for 'data: ' lines, so decoding and
+                # re-encoding every frame here was pure overhead
+                async for chunk in response.aiter_raw():
+                    yield chunk
+
         return Response(generate(), mimetype='text/event-stream')
     
     except Exception as e:
@@ -390,7 +701,7 @@ Answer the user's question based on this context."""
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
@@ -414,4 +725,10 @@ if __name__ == '__main__':
     print(f"✓ Vector embeddings: {collection.count()}")
     print("\nStarting server on http://localhost:5000")
     print("RAG is ENABLED - uploaded documents will be searchable!\n")
-    app.run(debug=True, port=5000)
\ No newline at end of file
+
+    # Debug mode (reloader + interactive debugger) adds per-request
+    # overhead, so it's opt-in via QUART_DEBUG=1. For production or any
+    # benchmarking, run under a real ASGI server instead:
+    #   hypercorn --workers $(nproc) backend.server:app
+    debug_mode = os.getenv('QUART_DEBUG', '').lower() in ('1', 'true')
+    app.run(debug=debug_mode, port=5000)
\ No newline at end of file